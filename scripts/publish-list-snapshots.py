@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+RECS — Publish static snapshots of shared lists
+Compares the currently public lists in Supabase against the last run,
+rebuilds the ones whose updated_at or owner's overlay version moved, and
+writes each as an immutable, content-addressed JSON bundle holding only
+the listed venues' display fields and thumbnail (including places the
+owner added themselves, with the owner's edits applied).
+Lists that were deleted or made private are dropped from the manifest and
+their bundles deleted.
+
+  lists/index.json            slug -> { file, updated_at, owner_version }   (short cache)
+  lists/s/<slug>.<hash>.json  snapshot bundle                               (immutable)
+
+index.html renders a published list straight from its bundle, without
+loading the full venue data or touching the database — RLS is not
+consulted on those views. Run this from cron every 10 minutes, and
+redeploy the static host after each run that changed something:
+
+  */10 * * * *  cd /path/to/recs && SUPABASE_SERVICE_KEY=... \
+                python3 scripts/publish-list-snapshots.py && <deploy>
+
+Between runs, a list that was edited, deleted or made private keeps being
+served from its last bundle: up to the cron interval plus the deploy time,
+plus the manifest's 5-minute cache in visitors' browsers. Anyone who kept
+a bundle URL can read it until it is deleted here and redeployed.
+
+Needs SUPABASE_SERVICE_KEY in the environment.
+Pass --all to rebuild every snapshot (e.g. after editing recs-data.js).
+"""
+
+import glob
+import hashlib
+import json
+import os
+import re
+import sys
+import urllib.request
+import urllib.parse
+import urllib.error
+
+SUPABASE_URL = os.environ.get("SUPABASE_URL", "https://tytqghikcwkvdordqtog.supabase.co")
+SUPABASE_SERVICE_KEY = os.environ.get("SUPABASE_SERVICE_KEY")
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_FILE = os.path.join(ROOT_DIR, "recs-data.js")
+PHOTO_MAP_FILE = os.path.join(ROOT_DIR, "recs-photo-map.js")
+LISTS_DIR = os.path.join(ROOT_DIR, "lists")
+SNAPSHOT_DIR = os.path.join(LISTS_DIR, "s")
+MANIFEST_FILE = os.path.join(LISTS_DIR, "index.json")
+
+# Fields the card, popup and modal need to render a venue
+DISPLAY_FIELDS = [
+    "id", "name", "description", "cuisine", "category", "price", "rating",
+    "area", "region", "userNote", "mapsUrl", "emoji", "tags", "lat", "lng",
+    "instagram",
+]
+
+def _load_js_literal(path, var_name):
+    """Read `const VAR = <literal>;` from a data file as JSON."""
+    with open(path, 'r') as f:
+        content = f.read()
+
+    start = content.index(f"const {var_name} =") + len(f"const {var_name} =")
+    body = content[start:].strip().rstrip(';')
+    # Drop whole-line comments (URLs contain "//", so only strip at line start)
+    body = re.sub(r'^\s*//.*$', '', body, flags=re.MULTILINE)
+    # Quote bare object keys and drop trailing commas
+    body = re.sub(r'^(\s*)([A-Za-z_]\w*):', r'\1"\2":', body, flags=re.MULTILINE)
+    body = re.sub(r',(\s*[\]}])', r'\1', body)
+    return json.loads(body)
+
+def _rest_get(table, params):
+    """GET rows from the Supabase REST API with the service key (bypasses RLS)."""
+    url = f"{SUPABASE_URL}/rest/v1/{table}?{urllib.parse.urlencode(params)}"
+
+    req = urllib.request.Request(url)
+    req.add_header('apikey', SUPABASE_SERVICE_KEY)
+    req.add_header('Authorization', f"Bearer {SUPABASE_SERVICE_KEY}")
+    req.add_header('Accept', 'application/json')
+
+    try:
+        with urllib.request.urlopen(req) as resp:
+            return json.loads(resp.read().decode())
+    except urllib.error.HTTPError as e:
+        print(f"  ⚠ Fetch failed for {table}: {e.code} {e.read().decode()[:200]}")
+    except Exception as e:
+        print(f"  ⚠ Fetch error for {table}: {e}")
+    return None
+
+def fetch_public_index():
+    """Slug -> (updated_at, owner's overlay_version) for every list that is public right now."""
+    rows = _rest_get("shared_lists", {
+        "select": "slug,updated_at,profiles(overlay_version)",
+        "is_public": "eq.true",
+    })
+    if rows is None:
+        return None
+    return {r['slug']: (r['updated_at'], (r.get('profiles') or {}).get('overlay_version', 0)) for r in rows}
+
+def fetch_lists(slugs):
+    """Full rows for the given public lists."""
+    return _rest_get("shared_lists", {
+        "select": "slug,profile_id,title,description,venue_ids,updated_at",
+        "is_public": "eq.true",
+        "slug": f"in.({','.join(slugs)})",
+    })
+
+def fetch_user_places(profile_ids):
+    """Places the list owners added themselves, keyed by (profile_id, venue_id),
+    with the owners' field edits applied (user_places.data is never updated)."""
+    owners = f"in.({','.join(profile_ids)})"
+    rows = _rest_get("user_places", {"select": "profile_id,venue_id,data", "profile_id": owners})
+    edit_rows = _rest_get("venue_edits", {"select": "profile_id,venue_id,field,value", "profile_id": owners})
+    if rows is None or edit_rows is None:
+        return None
+
+    places = {(r['profile_id'], r['venue_id']): dict(r['data']) for r in rows}
+    for e in edit_rows:
+        place = places.get((e['profile_id'], e['venue_id']))
+        if place is not None:
+            place[e['field']] = e['value']
+    return places
+
+def build_snapshot(lst, venues_by_id, owner_places, photos):
+    """Build the snapshot bundle for one list. Unknown venue ids are skipped."""
+    venues = []
+    for vid in lst.get('venue_ids') or []:
+        venue = venues_by_id.get(vid) or owner_places.get((lst['profile_id'], vid))
+        if not venue:
+            continue
+        entry = {k: venue[k] for k in DISPLAY_FIELDS if k in venue}
+        gallery = photos.get(vid)
+        if gallery:
+            entry['photo'] = gallery[0] if isinstance(gallery, list) else gallery
+        venues.append(entry)
+
+    return {
+        "slug": lst['slug'],
+        "title": lst['title'],
+        "description": lst.get('description'),
+        "venue_ids": [v['id'] for v in venues],
+        "updated_at": lst['updated_at'],
+        "venues": venues,
+    }
+
+def write_snapshot(snapshot):
+    """Write a snapshot under its content hash and return the relative path."""
+    body = json.dumps(snapshot, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    digest = hashlib.sha256(body.encode('utf-8')).hexdigest()[:12]
+    filename = f"{snapshot['slug']}.{digest}.json"
+    filepath = os.path.join(SNAPSHOT_DIR, filename)
+
+    if not os.path.exists(filepath):
+        with open(filepath, 'w') as f:
+            f.write(body)
+    return f"lists/s/{filename}"
+
+def main():
+    print("📋 RECS Shared List Snapshots")
+    print("=" * 50)
+
+    if not SUPABASE_SERVICE_KEY:
+        print("⚠ Set SUPABASE_SERVICE_KEY (needed to read list owners' places)")
+        sys.exit(1)
+
+    rebuild = '--all' in sys.argv[1:]
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+
+    manifest = {}
+    if os.path.exists(MANIFEST_FILE):
+        with open(MANIFEST_FILE, 'r') as f:
+            manifest = json.load(f)
+        print(f"Loaded {len(manifest)} published lists\n")
+
+    public = fetch_public_index()
+    if public is None:
+        sys.exit(1)
+
+    # Lists deleted or made private since the last run are unpublished at once
+    removed = sorted(set(manifest) - set(public))
+    for slug in removed:
+        del manifest[slug]
+        # Slugs never contain dots, so this only matches this list's bundles
+        for path in glob.glob(os.path.join(SNAPSHOT_DIR, f"{slug}.*.json")):
+            os.remove(path)
+        print(f"  ✗ {slug} — no longer public, snapshot removed")
+
+    # Owner edits don't touch shared_lists.updated_at, so their overlay
+    # version is tracked too. Unrelated edits rebuild to the same hash.
+    changed = sorted(
+        slug for slug, (updated_at, owner_version) in public.items()
+        if rebuild
+        or manifest.get(slug, {}).get('updated_at') != updated_at
+        or manifest.get(slug, {}).get('owner_version') != owner_version
+    )
+    print(f"{len(changed)} lists changed, {len(removed)} unpublished\n")
+
+    stale = set()
+    if changed:
+        lists = fetch_lists(changed)
+        owner_places = fetch_user_places(sorted({l['profile_id'] for l in lists or []}))
+        if lists is None or owner_places is None:
+            sys.exit(1)
+
+        venues_by_id = {v['id']: v for v in _load_js_literal(DATA_FILE, "RECS_VENUES")}
+        photos = _load_js_literal(PHOTO_MAP_FILE, "RECS_PHOTOS")
+
+        for lst in lists:
+            snapshot = build_snapshot(lst, venues_by_id, owner_places, photos)
+            path = write_snapshot(snapshot)
+            previous = manifest.get(lst['slug'])
+            if previous and previous['file'] != path:
+                stale.add(previous['file'])
+            manifest[lst['slug']] = {
+                "file": path,
+                "updated_at": lst['updated_at'],
+                "owner_version": public[lst['slug']][1],
+            }
+            print(f"  ✓ {lst['slug']} — {len(snapshot['venues'])} venues → {path}")
+
+    with open(MANIFEST_FILE, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    # Superseded bundles of still-public lists may be cached by clients that
+    # fetched a previous manifest, so only report them rather than deleting
+    stale -= {m['file'] for m in manifest.values()}
+    if stale:
+        print(f"\n{len(stale)} superseded snapshots can be removed after the cache window:")
+        for path in sorted(stale):
+            print(f"  {path}")
+
+    print(f"\n{'=' * 50}")
+    print(f"✅ Done! {len(changed)} snapshots published, {len(removed)} removed")
+    print(f"📄 Manifest saved to: {MANIFEST_FILE}")
+
+if __name__ == '__main__':
+    main()
@@ -12,6 +12,7 @@ create table public.profiles (
   email text,
   display_name text default 'User',
   avatar_emoji text default '🙂',
+  overlay_version bigint not null default 0,  -- last version handed to this user's overlay rows
   created_at timestamptz default now()
 );
 
@@ -152,8 +153,122 @@ create policy "Users can update own lists"
 create policy "Users can delete own lists"
   on public.shared_lists for delete using (auth.uid() = profile_id);
 
+-- Keep updated_at current so scripts/publish-list-snapshots.py can tell
+-- which published lists changed since its last run. Published lists are
+-- served from static snapshots that bypass the select policies above, so
+-- a list made private or deleted stays visible until the next publish run
+-- (see the script's docstring for the schedule).
+create or replace function public.touch_updated_at()
+returns trigger as $$
+begin
+  new.updated_at = now();
+  return new;
+end;
+$$ language plpgsql;
+
+create trigger shared_lists_touch_updated_at
+  before update on public.shared_lists
+  for each row execute function public.touch_updated_at();
+
+
+-- 7. USER OVERLAY (synced user places + field-level venue edits)
+-- Every write stamps the row with the next value of the owner's
+-- profiles.overlay_version, so a device only pulls rows with
+-- version > the last one it has seen. Bumping the counter row-locks the
+-- profile until commit, so a user's versions are handed out in commit
+-- order and a late-committing row can never fall behind a watermark.
+create or replace function public.stamp_overlay_version()
+returns trigger as $$
+begin
+  update public.profiles
+    set overlay_version = overlay_version + 1
+    where id = new.profile_id
+    returning overlay_version into new.version;
+  new.updated_at = now();
+  return new;
+end;
+$$ language plpgsql security definer set search_path = public;
+
+-- A device syncing old local edits must not overwrite a newer value
+-- from another device, and re-sending an unchanged edit must not bump its
+-- version. Runs before the version stamp (triggers fire in name order),
+-- and returning null skips the update.
+create or replace function public.skip_stale_edit()
+returns trigger as $$
+begin
+  if new.edited_at < old.edited_at
+     or (new.edited_at = old.edited_at and new.value is not distinct from old.value) then
+    return null;
+  end if;
+  return new;
+end;
+$$ language plpgsql;
+
+create table public.user_places (
+  id uuid primary key default gen_random_uuid(),
+  profile_id uuid references public.profiles(id) on delete cascade,
+  venue_id text not null,
+  data jsonb not null,
+  version bigint not null default 0,
+  created_at timestamptz default now(),
+  updated_at timestamptz default now(),
+  unique(profile_id, venue_id)
+);
+
+alter table public.user_places enable row level security;
+
+create policy "Users can view own places"
+  on public.user_places for select using (auth.uid() = profile_id);
+
+create policy "Users can insert own places"
+  on public.user_places for insert with check (auth.uid() = profile_id);
+
+create policy "Users can update own places"
+  on public.user_places for update using (auth.uid() = profile_id);
+
+create policy "Users can delete own places"
+  on public.user_places for delete using (auth.uid() = profile_id);
+
+create trigger user_places_stamp_version
+  before insert or update on public.user_places
+  for each row execute function public.stamp_overlay_version();
+
+create table public.venue_edits (
+  id uuid primary key default gen_random_uuid(),
+  profile_id uuid references public.profiles(id) on delete cascade,
+  venue_id text not null,
+  field text not null,
+  value jsonb,
+  edited_at timestamptz not null default now(),  -- when the edit was made on the device
+  version bigint not null default 0,
+  updated_at timestamptz default now(),
+  unique(profile_id, venue_id, field)
+);
+
+alter table public.venue_edits enable row level security;
+
+create policy "Users can view own edits"
+  on public.venue_edits for select using (auth.uid() = profile_id);
+
+create policy "Users can insert own edits"
+  on public.venue_edits for insert with check (auth.uid() = profile_id);
+
+create policy "Users can update own edits"
+  on public.venue_edits for update using (auth.uid() = profile_id);
+
+create policy "Users can delete own edits"
+  on public.venue_edits for delete using (auth.uid() = profile_id);
+
+create trigger venue_edits_guard_stale
+  before update on public.venue_edits
+  for each row execute function public.skip_stale_edit();
+
+create trigger venue_edits_stamp_version
+  before insert or update on public.venue_edits
+  for each row execute function public.stamp_overlay_version();
+
 
--- 7. AGGREGATION VIEW — venue stats
+-- 8. AGGREGATION VIEW — venue stats
 create or replace view public.venue_stats as
 select
   v.venue_id,
@@ -179,15 +294,17 @@ left join (
 ) td on v.venue_id = td.venue_id;
 
 
--- 8. INDEXES
+-- 9. INDEXES
 create index idx_checkins_venue on public.checkins(venue_id);
 create index idx_checkins_profile on public.checkins(profile_id);
 create index idx_thumbs_venue on public.thumbs(venue_id);
 create index idx_thumbs_direction on public.thumbs(venue_id, direction);
 create index idx_user_saves_profile on public.user_saves(profile_id);
 create index idx_shared_lists_slug on public.shared_lists(slug);
+create index idx_user_places_version on public.user_places(profile_id, version);
+create index idx_venue_edits_version on public.venue_edits(profile_id, version);
 create index idx_follows_follower on public.follows(follower_id);
 create index idx_follows_following on public.follows(following_id);
 
--- 9. REALTIME — enable for checkins, thumbs, follows
+-- 10. REALTIME — enable for checkins, thumbs, follows, user_places, venue_edits
 -- (Enable in Supabase Dashboard > Database > Replication > toggle on)